@@ -2,7 +2,7 @@ import struct
 
 import kkloader
 import kkloader.KoikatuCharaData
-from kkloader.funcs import get_png, load_length, load_type
+from kkloader.funcs import get_png, load_length, load_list, load_type
 
 
 class EmocreCharaData(kkloader.KoikatuCharaData):
@@ -24,15 +24,12 @@ class EmocreCharaData(kkloader.KoikatuCharaData):
         self.language = load_type(data, "i")
         self.userid = load_length(data, "b")
         self.dataid = load_length(data, "b")
-        package_length = load_type(data, "i")
-        self.packages = []
-        for i in range(package_length):
-            self.packages.append(load_type(data, "i"))
+        self.packages = load_list(data, "i")
 
     def _make_bytes_header(self):
         ipack = struct.Struct("i")
         bpack = struct.Struct("b")
-        packages = b"".join(list(map(lambda x: ipack.pack(x), self.packages)))
+        packages = struct.pack("{}i".format(len(self.packages)), *self.packages)
         data = b"".join(
             [
                 self.image,
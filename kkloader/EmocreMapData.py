@@ -4,7 +4,29 @@ import io
 import json
 import struct
 
-from kkloader.funcs import get_png, load_length, load_string, load_type
+from kkloader.funcs import get_png, load_list, load_string, load_type, write_list, write_string
+
+# json.dumps() builds a new encoder on every call when separators are given,
+# and json.loads() sniffs the encoding of every bytes input; the values are
+# always short UTF-8 JSON, so both are set up once and used directly.
+json_encoder = json.JSONEncoder(separators=(",", ":"))
+json_decoder = json.JSONDecoder()
+
+# Fixed-size field runs, shared by load and save so both sides use the same layout.
+# objects_num and map_scene of a map (after 0.0.5.2)
+scene_head = struct.Struct("<ib")
+# camera_dist, camera_parse and graphic_size
+camera_tail = struct.Struct("<3f")
+# light_intensity, light_rot0, light_rot1, shadow, map_no and map_type
+light_tail = struct.Struct("<3fb2i")
+# treestate and visible of a node
+node_state = struct.Struct("<ib")
+# package, no and animspeed of an item
+item_head = struct.Struct("<2if")
+# key and clamp of an item pattern
+pattern_head = struct.Struct("<ib")
+# emissionpower and lightcancel of an item
+item_emission = struct.Struct("<2f")
 
 
 class EmocreMapData:
@@ -33,44 +55,41 @@ class EmocreMapData:
         if contains_png:
             em.png_data = get_png(data_stream)
         em.product_no = load_type(data_stream, "i")
-        em.header = load_length(data_stream, "b")
-        em.version = load_length(data_stream, "b")
-        em.userid = load_length(data_stream, "b")
-        em.dataid = load_length(data_stream, "b")
+        em.header = load_string(data_stream)
+        em.version = load_string(data_stream)
+        em.userid = load_string(data_stream)
+        em.dataid = load_string(data_stream)
 
-        length = load_type(data_stream, "i")
-        em.packages = []
-        for i in range(length):
-            em.packages.append(load_type(data_stream, "i"))
-        em.name = load_length(data_stream, "b")
+        em.packages = load_list(data_stream, "i")
+        em.name = load_string(data_stream)
         em.language = load_type(data_stream, "i")
-        if "0.0.5.2" < em.version.decode():
-            em.objects_num = load_type(data_stream, "i")
-            em.map_scene = load_type(data_stream, "b")
+        version = version_tuple(em.version)
+        if version > (0, 0, 5, 2):
+            em.objects_num, em.map_scene = scene_head.unpack(data_stream.read(scene_head.size))
 
         em.nodes = []
+        has_padding = version < (0, 0, 5, 2)
         length = load_type(data_stream, "i")
         for i in range(length):
-            if "0.0.5.2" > em.version.decode():
-                load_type(data_stream, "i")
+            if has_padding:
+                data_stream.seek(4, io.SEEK_CUR)
             nodetype = load_type(data_stream, "i")
-            em.nodes.append(Node(data_stream, em.version, nodetype=nodetype))
-
-        em.camera_version = load_length(data_stream, "b")
-        em.camera_pos = json.loads(load_length(data_stream, "b"))
-        em.camera_rot = json.loads(load_length(data_stream, "b"))
-        em.camera_dist = load_type(data_stream, "f")
-        em.camera_parse = load_type(data_stream, "f")
-        em.graphic_size = load_type(data_stream, "f")
-
-        em.light_color = json.loads(load_length(data_stream, "b"))
-        em.light_intensity = load_type(data_stream, "f")
-        em.light_rot0 = load_type(data_stream, "f")
-        em.light_rot1 = load_type(data_stream, "f")
-        em.shadow = load_type(data_stream, "b")
-
-        em.map_no = load_type(data_stream, "i")
-        em.map_type = load_type(data_stream, "i")
+            em.nodes.append(Node(data_stream, version, nodetype=nodetype))
+
+        em.camera_version = load_string(data_stream)
+        em.camera_pos = load_json(data_stream)
+        em.camera_rot = load_json(data_stream)
+        em.camera_dist, em.camera_parse, em.graphic_size = camera_tail.unpack(data_stream.read(camera_tail.size))
+
+        em.light_color = load_json(data_stream)
+        (
+            em.light_intensity,
+            em.light_rot0,
+            em.light_rot1,
+            em.shadow,
+            em.map_no,
+            em.map_type,
+        ) = light_tail.unpack(data_stream.read(light_tail.size))
 
         return em
 
@@ -83,17 +102,15 @@ class EmocreMapData:
         write_string(data, self.version)
         write_string(data, self.userid)
         write_string(data, self.dataid)
-        write_type(data, len(self.packages), "i")
-        for i in self.packages:
-            write_type(data, i, "i")
+        write_list(data, self.packages, "i")
         write_string(data, self.name)
         write_type(data, self.language, "i")
         if hasattr(self, "objects_num"):
-            write_type(data, self.objects_num, "i")
-            write_type(data, self.map_scene, "b")
+            data.write(scene_head.pack(self.objects_num, self.map_scene))
+        has_padding = version_tuple(self.version) < (0, 0, 5, 2)
         write_type(data, len(self.nodes), "i")
         for i in self.nodes:
-            if "0.0.5.2" > self.version.decode():
+            if has_padding:
                 write_type(data, -1, "i")
             write_type(data, i.nodetype, "i")
             i.serialize(data)
@@ -101,18 +118,19 @@ class EmocreMapData:
         write_string(data, self.camera_version)
         write_json(data, self.camera_pos)
         write_json(data, self.camera_rot)
-        write_type(data, self.camera_dist, "f")
-        write_type(data, self.camera_parse, "f")
-        write_type(data, self.graphic_size, "f")
+        data.write(camera_tail.pack(self.camera_dist, self.camera_parse, self.graphic_size))
 
         write_json(data, self.light_color)
-        write_type(data, self.light_intensity, "f")
-        write_type(data, self.light_rot0, "f")
-        write_type(data, self.light_rot1, "f")
-        write_type(data, self.shadow, "b")
-
-        write_type(data, self.map_no, "i")
-        write_type(data, self.map_type, "i")
+        data.write(
+            light_tail.pack(
+                self.light_intensity,
+                self.light_rot0,
+                self.light_rot1,
+                self.shadow,
+                self.map_no,
+                self.map_type,
+            )
+        )
 
         data.seek(0)
         return data.read()
@@ -125,9 +143,9 @@ class EmocreMapData:
 
 class Quantity:
     def __init__(self, data_stream):
-        self.pos = json.loads(load_length(data_stream, "b"))
-        self.angle = json.loads(load_length(data_stream, "b"))
-        self.scale = json.loads(load_length(data_stream, "b"))
+        self.pos = load_json(data_stream)
+        self.angle = load_json(data_stream)
+        self.scale = load_json(data_stream)
 
     def serialize(self, datas):
         write_json(datas, self.pos)
@@ -137,121 +155,133 @@ class Quantity:
 
 class Node:
     def __init__(self, data_stream, version, nodetype=None, skip=False):
+        length = self._load(data_stream, version, nodetype, skip)
+
+        # Child nodes always come last in a node's record, so the subtree is
+        # read depth-first with an explicit stack instead of recursing.
+        stack = [(self, length)]
+        while stack:
+            parent, length = stack.pop()
+            if length <= 0:
+                continue
+            stack.append((parent, length - 1))
+            child = Node.__new__(Node)
+            child_length = child._load(data_stream, version, load_type(data_stream, "i"))
+            parent.nodes.append(child)
+            stack.append((child, child_length))
+
+    def _load(self, data_stream, version, nodetype, skip=False):
         self.nodetype = nodetype
         self.dickey = load_type(data_stream, "i")
         self.quantity = Quantity(data_stream)
         if not skip:
-            self.treestate = load_type(data_stream, "i")
-            self.visible = load_type(data_stream, "b")
-
-        if nodetype == 1:
-            self.package = load_type(data_stream, "i")
-            self.no = load_type(data_stream, "i")
-            self.animspeed = load_type(data_stream, "f")
-            self.colors = []
-            for i in range(8):
-                self.colors.append(json.loads(load_length(data_stream, "b")))
-            self.patterns = []
-            for i in range(3):
-                pattern = {}
-                pattern["key"] = load_type(data_stream, "i")
-                pattern["clamp"] = load_type(data_stream, "b")
-                pattern["uv"] = json.loads(load_length(data_stream, "b"))
-                pattern["rot"] = load_type(data_stream, "f")
-                self.patterns.append(pattern)
-            self.alpha = load_type(data_stream, "f")
-            self.linecolor = json.loads(load_length(data_stream, "b"))
-            self.linewidth = load_type(data_stream, "f")
-            self.emissioncolor = json.loads(load_length(data_stream, "b"))
-            self.emissionpower = load_type(data_stream, "f")
-            self.lightcancel = load_type(data_stream, "f")
-            if "0.0.3" < version.decode():
-                self.piller = Node(data_stream, version, skip=True)
-            if "0.0.5.3" < version.decode():
-                self.sielding = load_type(data_stream, "b")
-            self.nodes = []
-            length = load_type(data_stream, "i")
-            for i in range(length):
-                child_nodetype = load_type(data_stream, "i")
-                self.nodes.append(Node(data_stream, version, child_nodetype))
-
-        elif nodetype == 3:
-            self.name = load_string(data_stream)
-            self.nodes = []
-            length = load_type(data_stream, "i")
-            for i in range(length):
-                child_nodetype = load_type(data_stream, "i")
-                self.nodes.append(Node(data_stream, version, child_nodetype))
-
-        elif nodetype == 4:
-            self.name = load_length(data_stream, "b")
-            self.center = json.loads(load_length(data_stream, "b"))
-            self.size = json.loads(load_length(data_stream, "b"))
-            self.nodes = []
-            length = load_type(data_stream, "i")
-            for i in range(length):
-                child_nodetype = load_type(data_stream, "i")
-                self.nodes.append(Node(data_stream, version, child_nodetype))
+            self.treestate, self.visible = node_state.unpack(data_stream.read(node_state.size))
+
+        loader = self._loaders.get(nodetype)
+        if loader is None:
+            return 0
+        loader(self, data_stream, version)
+
+        self.nodes = []
+        return load_type(data_stream, "i")
+
+    def _load_item(self, data_stream, version):
+        self.package, self.no, self.animspeed = item_head.unpack(data_stream.read(item_head.size))
+        self.colors = [load_json(data_stream) for i in range(8)]
+        self.patterns = []
+        for i in range(3):
+            pattern = {}
+            pattern["key"], pattern["clamp"] = pattern_head.unpack(data_stream.read(pattern_head.size))
+            pattern["uv"] = load_json(data_stream)
+            pattern["rot"] = load_type(data_stream, "f")
+            self.patterns.append(pattern)
+        self.alpha = load_type(data_stream, "f")
+        self.linecolor = load_json(data_stream)
+        self.linewidth = load_type(data_stream, "f")
+        self.emissioncolor = load_json(data_stream)
+        self.emissionpower, self.lightcancel = item_emission.unpack(data_stream.read(item_emission.size))
+        if version > (0, 0, 3):
+            self.piller = Node(data_stream, version, skip=True)
+        if version > (0, 0, 5, 3):
+            self.sielding = load_type(data_stream, "b")
+
+    def _load_folder(self, data_stream, version):
+        self.name = load_string(data_stream)
+
+    def _load_area(self, data_stream, version):
+        self.name = load_string(data_stream)
+        self.center = load_json(data_stream)
+        self.size = load_json(data_stream)
 
     def serialize(self, datas):
+        # The subtree is written depth-first with an explicit stack, mirroring __init__.
+        stack = [iter(self._serialize(datas))]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                continue
+            write_type(datas, child.nodetype, "i")
+            stack.append(iter(child._serialize(datas)))
+
+    def _serialize(self, datas):
         write_type(datas, self.dickey, "i")
         self.quantity.serialize(datas)
         if hasattr(self, "treestate"):
-            write_type(datas, self.treestate, "i")
-            write_type(datas, self.visible, "b")
-
-        if self.nodetype == 1:
-            write_type(datas, self.package, "i")
-            write_type(datas, self.no, "i")
-            write_type(datas, self.animspeed, "f")
-            for i in self.colors:
-                write_json(datas, i)
-            for i in self.patterns:
-                write_type(datas, i["key"], "i")
-                write_type(datas, i["clamp"], "b")
-                write_json(datas, i["uv"])
-                write_type(datas, i["rot"], "f")
-            write_type(datas, self.alpha, "f")
-            write_json(datas, self.linecolor)
-            write_type(datas, self.linewidth, "f")
-            write_json(datas, self.emissioncolor)
-            write_type(datas, self.emissionpower, "f")
-            write_type(datas, self.lightcancel, "f")
-            if hasattr(self, "piller"):
-                self.piller.serialize(datas)
-            if hasattr(self, "sielding"):
-                write_type(datas, self.sielding, "b")
-            write_type(datas, len(self.nodes), "i")
-            for i in self.nodes:
-                write_type(datas, i.nodetype, "i")
-                i.serialize(datas)
-
-        elif self.nodetype == 3:
-            write_string(datas, self.name)
-            write_type(datas, len(self.nodes), "i")
-            for i in self.nodes:
-                write_type(datas, i.nodetype, "i")
-                i.serialize(datas)
-
-        elif self.nodetype == 4:
-            write_string(datas, self.name)
-            write_json(datas, self.center)
-            write_json(datas, self.size)
-            write_type(datas, len(self.nodes), "i")
-            for i in self.nodes:
-                write_type(datas, i.nodetype, "i")
-                i.serialize(datas)
+            datas.write(node_state.pack(self.treestate, self.visible))
+
+        serializer = self._serializers.get(self.nodetype)
+        if serializer is None:
+            return []
+        serializer(self, datas)
+
+        write_type(datas, len(self.nodes), "i")
+        return self.nodes
+
+    def _serialize_item(self, datas):
+        datas.write(item_head.pack(self.package, self.no, self.animspeed))
+        for i in self.colors:
+            write_json(datas, i)
+        for i in self.patterns:
+            datas.write(pattern_head.pack(i["key"], i["clamp"]))
+            write_json(datas, i["uv"])
+            write_type(datas, i["rot"], "f")
+        write_type(datas, self.alpha, "f")
+        write_json(datas, self.linecolor)
+        write_type(datas, self.linewidth, "f")
+        write_json(datas, self.emissioncolor)
+        datas.write(item_emission.pack(self.emissionpower, self.lightcancel))
+        if hasattr(self, "piller"):
+            self.piller.serialize(datas)
+        if hasattr(self, "sielding"):
+            write_type(datas, self.sielding, "b")
+
+    def _serialize_folder(self, datas):
+        write_string(datas, self.name)
+
+    def _serialize_area(self, datas):
+        write_string(datas, self.name)
+        write_json(datas, self.center)
+        write_json(datas, self.size)
+
+    _loaders = {1: _load_item, 3: _load_folder, 4: _load_area}
+    _serializers = {1: _serialize_item, 3: _serialize_folder, 4: _serialize_area}
+
+
+# Versions compare numerically per component (0.0.10 is newer than 0.0.9),
+# so every component must be an integer.
+def version_tuple(version):
+    return tuple(int(x) for x in version.decode().split("."))
+
+
+def load_json(data_stream):
+    return json_decoder.decode(load_string(data_stream).decode())
 
 
 def write_json(datas, value):
-    converted = json.dumps(value, separators=(",", ":")).encode()
+    converted = json_encoder.encode(value).encode()
     write_string(datas, converted)
 
 
 def write_type(data_stream, value, format):
     data_stream.write(struct.pack(format, value))
-
-
-def write_string(datas, value):
-    datas.write(struct.pack("b", len(value)))
-    datas.write(value)
@@ -1,10 +1,14 @@
 # -*- coding:utf-8 -*-
 
 import io
+import struct
 
 from kkloader.EmocreCharaData import EmocreCharaData
 from kkloader.EmocreMapData import EmocreMapData
-from kkloader.funcs import get_png, load_length, load_type
+from kkloader.funcs import get_png, load_length, load_list, load_type
+
+# males, females, isplaying, uses_adv and uses_hpart of a scene
+scene_counts = struct.Struct("<2i3b")
 
 
 class EmocreSceneData:
@@ -37,23 +41,16 @@ class EmocreSceneData:
         es.title = load_length(data_stream, "b")
         es.comment = load_length(data_stream, "b")
         es.defaultbgm = load_type(data_stream, "i")
-        es.tags = []
-        length = load_type(data_stream, "i")
-        for i in range(length):
-            es.tags.append(load_type(data_stream, "i"))
-        es.males = load_type(data_stream, "i")
-        es.females = load_type(data_stream, "i")
-        es.isplaying = load_type(data_stream, "b")
-        es.uses_adv = load_type(data_stream, "b")
-        es.uses_hpart = load_type(data_stream, "b")
-        length = load_type(data_stream, "i")
-        es.charapackages = []
-        for i in range(length):
-            es.charapackages.append(load_type(data_stream, "i"))
-        length = load_type(data_stream, "i")
-        es.mappackages = []
-        for i in range(length):
-            es.mappackages.append(load_type(data_stream, "i"))
+        es.tags = load_list(data_stream, "i")
+        (
+            es.males,
+            es.females,
+            es.isplaying,
+            es.uses_adv,
+            es.uses_hpart,
+        ) = scene_counts.unpack(data_stream.read(scene_counts.size))
+        es.charapackages = load_list(data_stream, "i")
+        es.mappackages = load_list(data_stream, "i")
         es.uses_mapset = load_type(data_stream, "b")
         es.mapobjects = load_type(data_stream, "i")
 
@@ -69,9 +69,9 @@ class Coordinate(BlockData):
 
     def serialize(self):
         data = []
+        pack = struct.Struct("i")
         for i in self.data:
             c = []
-            pack = struct.Struct("i")
 
             for f in self.fields:
                 serialized, length = msg_pack(i[f])
@@ -244,7 +244,7 @@ class Coordinate(BlockData):
                 c = {
                     "clothes": msg_unpack(load_length(data_stream, "i")),
                     "accessory": msg_unpack(load_length(data_stream, "i")),
-                    "enableMakeup": bool(load_type(data_stream, "b")),
+                    "enableMakeup": data_stream.read(1)[0] != 0,
                     "makeup": msg_unpack(load_length(data_stream, "i")),
                 }
                 self.data.append(c)
@@ -260,9 +260,9 @@ class Coordinate(BlockData):
     def serialize(self):
         if self.version == "0.0.0":
             data = []
+            pack = struct.Struct("i")
             for i in self.data:
                 c = []
-                pack = struct.Struct("i")
 
                 serialized, length = msg_pack(i["clothes"])
                 c.extend([pack.pack(length), serialized])
@@ -1,10 +1,20 @@
 # -*- coding:utf-8 -*-
 
 import io
+import itertools
 import struct
 
 from kkloader import KoikatuCharaData
-from kkloader.funcs import load_string, load_type, write_string
+from kkloader.funcs import (
+    fields_struct,
+    load_fields,
+    load_list,
+    load_string,
+    load_type,
+    write_fields,
+    write_list,
+    write_string,
+)
 
 
 class KoikatuSaveData:
@@ -29,6 +39,10 @@ class KoikatuSaveData:
         ("withheroine", "i"),
         ("dateheroine", "i"),
     ]
+    variables_1_struct = fields_struct(variables_1)
+    variables_2_struct = fields_struct(variables_2)
+    header_struct = struct.Struct("<ibi")
+    action_control_struct = struct.Struct("<3i")
 
     def __init__(self):
         pass
@@ -80,16 +94,12 @@ class KoikatuSaveData:
     def _load_header(self, data_stream):
         self.version = load_string(data_stream)
         self.school_name = load_string(data_stream)
-        self.emblem = load_type(data_stream, "i")
-        self.opening = load_type(data_stream, "b")
-        self.week = load_type(data_stream, "i")
+        self.emblem, self.opening, self.week = self.header_struct.unpack(data_stream.read(self.header_struct.size))
 
     def _serialize_header(self, data_stream):
         write_string(data_stream, self.version)
         write_string(data_stream, self.school_name)
-        data_stream.write(struct.pack("i", self.emblem))
-        data_stream.write(struct.pack("b", self.opening))
-        data_stream.write(struct.pack("i", self.week))
+        data_stream.write(self.header_struct.pack(self.emblem, self.opening, self.week))
 
     def _load_player(self, data_stream):
         self.player = CharaInfo(data_stream)
@@ -98,12 +108,10 @@ class KoikatuSaveData:
         self.player.serialize(data_stream)
 
     def _load_vars1(self, data_stream):
-        for name, fmt in self.variables_1:
-            setattr(self, name, load_type(data_stream, fmt))
+        load_fields(self, data_stream, self.variables_1, self.variables_1_struct)
 
     def _serialize_vars1(self, data_stream):
-        for name, fmt in self.variables_1:
-            data_stream.write(struct.pack(fmt, getattr(self, name)))
+        write_fields(self, data_stream, self.variables_1, self.variables_1_struct)
 
     def _load_heroines(self, data_stream):
         self.heroines = []
@@ -117,14 +125,10 @@ class KoikatuSaveData:
             i.serialize(data_stream)
 
     def _load_personality(self, data_stream):
-        self.met_personality = []
-        for i in range(load_type(data_stream, "i")):
-            self.met_personality.append(load_type(data_stream, "i"))
+        self.met_personality = load_list(data_stream, "i")
 
     def _serialize_personality(self, data_stream):
-        data_stream.write(struct.pack("i", len(self.met_personality)))
-        for i in self.met_personality:
-            data_stream.write(struct.pack("i", i))
+        write_list(data_stream, self.met_personality, "i")
 
     def _load_club_data(self, data_stream):
         self.clubpoint = load_type(data_stream, "i")
@@ -132,14 +136,9 @@ class KoikatuSaveData:
         self.clubcontents = {}
         for i in range(load_type(data_stream, "i")):
             key = load_type(data_stream, "i")
-            clubcontent = []
-            for n in range(load_type(data_stream, "i")):
-                clubcontent.append(load_type(data_stream, "i"))
-            self.clubcontents[key] = clubcontent
+            self.clubcontents[key] = load_list(data_stream, "i")
 
-        self.clubcontent_items = []
-        for i in range(load_type(data_stream, "i")):
-            self.clubcontent_items.append(load_type(data_stream, "i"))
+        self.clubcontent_items = load_list(data_stream, "i")
 
     def _serialize_club_data(self, data_stream):
         data_stream.write(struct.pack("i", self.clubpoint))
@@ -147,41 +146,30 @@ class KoikatuSaveData:
         data_stream.write(struct.pack("i", len(self.clubcontents)))
         for k in self.clubcontents:
             data_stream.write(struct.pack("i", k))
-            data_stream.write(struct.pack("i", len(self.clubcontents[k])))
-            for i in self.clubcontents[k]:
-                data_stream.write(struct.pack("i", i))
+            write_list(data_stream, self.clubcontents[k], "i")
 
-        data_stream.write(struct.pack("i", len(self.clubcontent_items)))
-        for i in self.clubcontent_items:
-            data_stream.write(struct.pack("i", i))
+        write_list(data_stream, self.clubcontent_items, "i")
 
     def _load_vars2(self, data_stream):
-        for name, fmt in self.variables_2:
-            setattr(self, name, load_type(data_stream, fmt))
+        load_fields(self, data_stream, self.variables_2, self.variables_2_struct)
 
     def _serialize_vars2(self, data_stream):
-        for name, fmt in self.variables_2:
-            data_stream.write(struct.pack(fmt, getattr(self, name)))
+        write_fields(self, data_stream, self.variables_2, self.variables_2_struct)
 
     def _load_action_controls(self, data_stream):
         self.action_controls = []
         for i in range(load_type(data_stream, "i")):
-            school_class = load_type(data_stream, "i")
-            school_class_idx = load_type(data_stream, "i")
+            school_class, school_class_idx, length = self.action_control_struct.unpack(data_stream.read(self.action_control_struct.size))
             action_control = []
-            for n in range(load_type(data_stream, "i")):
-                action_control.append([load_type(data_stream, "i"), load_type(data_stream, "i")])
+            if length > 0:
+                action_control = [list(pair) for pair in struct.iter_unpack("<2i", data_stream.read(8 * length))]
             self.action_controls.append([school_class, school_class_idx, action_control])
 
     def _serialize_action_controls(self, data_stream):
         data_stream.write(struct.pack("i", len(self.action_controls)))
         for i in self.action_controls:
-            data_stream.write(struct.pack("i", i[0]))
-            data_stream.write(struct.pack("i", i[1]))
-            data_stream.write(struct.pack("i", len(i[2])))
-            for n in i[2]:
-                data_stream.write(struct.pack("i", n[0]))
-                data_stream.write(struct.pack("i", n[1]))
+            data_stream.write(self.action_control_struct.pack(i[0], i[1], len(i[2])))
+            data_stream.write(struct.pack("<{}i".format(2 * len(i[2])), *itertools.chain.from_iterable(i[2])))
 
     def save(self, filename):
         data = bytes(self)
@@ -238,27 +226,21 @@ class HeroineInfo:
         ("is_first_girlfriend", "b"),
         ("intimacy", "i"),
     ]
+    variables_1_struct = fields_struct(variables_1)
+    variables_2_struct = fields_struct(variables_2)
+    variables_3_struct = fields_struct(variables_3)
 
     def __init__(self, data_stream):
         self.chara_info = CharaInfo(data_stream)
 
-        for name, fmt in self.variables_1:
-            setattr(self, name, load_type(data_stream, fmt))
+        load_fields(self, data_stream, self.variables_1, self.variables_1_struct)
 
-        self.h_exps = []
-        for i in range(load_type(data_stream, "i")):
-            self.h_exps.append(load_type(data_stream, "f"))
+        self.h_exps = load_list(data_stream, "f")
+        self.massage_exps = load_list(data_stream, "f")
 
-        self.massage_exps = []
-        for i in range(load_type(data_stream, "i")):
-            self.massage_exps.append(load_type(data_stream, "f"))
+        load_fields(self, data_stream, self.variables_2, self.variables_2_struct)
 
-        for name, fmt in self.variables_2:
-            setattr(self, name, load_type(data_stream, fmt))
-
-        self.talk_events = []
-        for i in range(load_type(data_stream, "i")):
-            self.talk_events.append(load_type(data_stream, "i"))
+        self.talk_events = load_list(data_stream, "i")
 
         self.talk_temper = data_stream.read(39)
         self.conffessed = load_type(data_stream, "b")
@@ -269,29 +251,19 @@ class HeroineInfo:
             value = load_type(data_stream, "f")
             self.motionspeeds[key] = value
 
-        for name, fmt in self.variables_3:
-            setattr(self, name, load_type(data_stream, fmt))
+        load_fields(self, data_stream, self.variables_3, self.variables_3_struct)
 
     def serialize(self, data_stream):
         self.chara_info.serialize(data_stream)
 
-        for name, fmt in self.variables_1:
-            data_stream.write(struct.pack(fmt, getattr(self, name)))
-
-        data_stream.write(struct.pack("i", len(self.h_exps)))
-        for i in self.h_exps:
-            data_stream.write(struct.pack("f", i))
+        write_fields(self, data_stream, self.variables_1, self.variables_1_struct)
 
-        data_stream.write(struct.pack("i", len(self.massage_exps)))
-        for i in self.massage_exps:
-            data_stream.write(struct.pack("f", i))
+        write_list(data_stream, self.h_exps, "f")
+        write_list(data_stream, self.massage_exps, "f")
 
-        for name, fmt in self.variables_2:
-            data_stream.write(struct.pack(fmt, getattr(self, name)))
+        write_fields(self, data_stream, self.variables_2, self.variables_2_struct)
 
-        data_stream.write(struct.pack("i", len(self.talk_events)))
-        for i in self.talk_events:
-            data_stream.write(struct.pack("i", i))
+        write_list(data_stream, self.talk_events, "i")
 
         data_stream.write(self.talk_temper)
         data_stream.write(struct.pack("b", self.conffessed))
@@ -301,5 +273,4 @@ class HeroineInfo:
             write_string(data_stream, k)
             data_stream.write(struct.pack("f", self.motionspeeds[k]))
 
-        for name, fmt in self.variables_3:
-            data_stream.write(struct.pack(fmt, getattr(self, name)))
+        write_fields(self, data_stream, self.variables_3, self.variables_3_struct)
@@ -49,7 +49,8 @@ class SummerVacationSaveData:
         # Data for each character
         for i in range(svs.chara_num):
             # The length of the data: length of the parameters (and 4 bytes representing that length) + character data length
-            cls._unsigned_int(data_stream)
+            # It is recomputed on save, so it is skipped here
+            data_stream.seek(4, io.SEEK_CUR)
             # Data about relationships between characters
             svs.chara_details.append(msg_unpack(load_length(data_stream, "<I")))
             # Character data
@@ -74,7 +75,7 @@ class SummerVacationSaveData:
         meta_b, meta_i = msg_pack(self.meta)
         meta_i_b = ipack(meta_i)
 
-        chara_byte, player_offset = self._bytes_charas()
+        chara_chunks, chara_section_length, player_offset = self._bytes_charas()
         chara_l_b = ipack(len(self.charas))
 
         # We want to calculate the offset from the start of the save data to the player's character section
@@ -82,7 +83,7 @@ class SummerVacationSaveData:
         player_offset += len(meta_b) + 4 + 8 + 4
         player_offset_b = qpack(player_offset)
 
-        data_length = len(meta_b) + len(chara_byte) + 4 + 8 + 4
+        data_length = len(meta_b) + chara_section_length + 4 + 8 + 4
         data_length_b = qpack(data_length)
 
         unknown_b = ipack(self.unknown)
@@ -92,42 +93,42 @@ class SummerVacationSaveData:
             meta_b,
             data_length_b,
             chara_l_b,
-            chara_byte,
+            *chara_chunks,
             unknown_b,
             player_offset_b,
         ]
 
         return b"".join(data_chunks)
 
-    # Create the bytes for the character data section
+    # Create the byte chunks for the character data section
+    # They are joined only once in __bytes__, so character data is not copied into intermediate buffers
     def _bytes_charas(self):
         ipack = struct.Struct("<I")
 
         player_offset = 0
         after_player = False
 
-        chara_bytes = []
+        chara_chunks = []
+        chara_section_length = 0
         for chara, chara_detail in zip(self.charas, self.chara_details):
             chara_detail_b, chara_detail_i = msg_pack(chara_detail)
             chara_detail_i_b = ipack.pack(chara_detail_i)
             chara_b = bytes(chara)
 
             # Convert the length of the character data to an integer
-            chara_length = sum(map(lambda x: len(x), [chara_detail_i_b, chara_detail_b, chara_b]))
-            chara_length_b = ipack.pack(chara_length)
-
-            chara_byte = b"".join([chara_length_b, chara_detail_i_b, chara_detail_b, chara_b])
+            chara_length = len(chara_detail_i_b) + len(chara_detail_b) + len(chara_b)
+            chara_chunks.extend([ipack.pack(chara_length), chara_detail_i_b, chara_detail_b, chara_b])
 
             if chara_detail["charasGameParam"]["isPC"]:
                 after_player = True
 
-            # If the player's character hasn't appeared yet, keep adding to the offset
+            # If the player's character hasn't appeared yet, keep adding to the offset (including the 4 length bytes)
             if not after_player:
-                player_offset += len(chara_byte)
+                player_offset += chara_length + 4
 
-            chara_bytes.append(chara_byte)
+            chara_section_length += chara_length + 4
 
-        return b"".join(chara_bytes), player_offset
+        return chara_chunks, chara_section_length, player_offset
 
     def save(self, filename):
         with open(filename, "wb") as f:
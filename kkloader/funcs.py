@@ -1,3 +1,4 @@
+import io
 import struct
 
 from msgpack import packb, unpackb
@@ -12,7 +13,7 @@ def load_string(data_stream):
     length = 0
     i = 0
     while True:
-        serial = struct.unpack("B", data_stream.read(struct.calcsize("B")))[0]
+        serial = data_stream.read(1)[0]
         length |= (0b01111111 & serial) << 7 * i
         if serial >> 7 != 1:
             break
@@ -26,18 +27,45 @@ def load_type(data_stream, struct_type):
 
 
 def write_string(data_stream, value):
-    length_bytes = b""
+    data = bytearray()
     length = len(value)
     while True:
         serial = length & 0b1111111
         if length >> 7 != 0:
             length = length >> 7
-            length_bytes += struct.pack("b", 0b10000000 | serial)
+            data.append(0b10000000 | serial)
         else:
-            length_bytes += struct.pack("b", serial)
+            data.append(serial)
             break
-    data_stream.write(length_bytes)
-    data_stream.write(value)
+    data += value
+    data_stream.write(data)
+
+
+def load_list(data_stream, struct_type):
+    length = load_type(data_stream, "i")
+    if length <= 0:
+        return []
+    list_struct = struct.Struct("{}{}".format(length, struct_type))
+    return list(list_struct.unpack(data_stream.read(list_struct.size)))
+
+
+def write_list(data_stream, values, struct_type):
+    data_stream.write(struct.pack("i", len(values)))
+    data_stream.write(struct.pack("{}{}".format(len(values), struct_type), *values))
+
+
+def fields_struct(fields):
+    return struct.Struct("<" + "".join(fmt for _, fmt in fields))
+
+
+def load_fields(obj, data_stream, fields, layout):
+    values = layout.unpack(data_stream.read(layout.size))
+    for (name, _), value in zip(fields, values):
+        setattr(obj, name, value)
+
+
+def write_fields(obj, data_stream, fields, layout):
+    data_stream.write(layout.pack(*[getattr(obj, name) for name, _ in fields]))
 
 
 def msg_unpack(data):
@@ -69,7 +97,7 @@ def get_png(data_stream):
     while True:
         length = load_type(data_stream, ">I")
         chunk_type = data_stream.read(4)
-        data_stream.read(length + 4)
+        data_stream.seek(length + 4, io.SEEK_CUR)
         if chunk_type == b"IEND":
             break
     end_pos = data_stream.tell()
@@ -0,0 +1,34 @@
+import io
+import struct
+
+from kkloader.funcs import load_list, load_string, write_list, write_string
+
+import pytest
+
+
+@pytest.mark.parametrize("length", [0, 127, 128, 16383, 16384])
+def test_string_roundtrip(length):
+    value = b"x" * length
+    data_stream = io.BytesIO()
+    write_string(data_stream, value)
+    data_stream.seek(0)
+    assert load_string(data_stream) == value
+    assert data_stream.read() == b""
+
+
+@pytest.mark.parametrize(
+    "values, struct_type",
+    [([], "i"), ([0, -1, 2**31 - 1], "i"), ([], "f"), ([0.5, -2.0, 1.25], "f")],
+)
+def test_list_roundtrip(values, struct_type):
+    data_stream = io.BytesIO()
+    write_list(data_stream, values, struct_type)
+    data_stream.seek(0)
+    assert load_list(data_stream, struct_type) == values
+    assert data_stream.read() == b""
+
+
+def test_load_list_negative_length():
+    data_stream = io.BytesIO(struct.pack("i", -1) + b"rest")
+    assert load_list(data_stream, "i") == []
+    assert data_stream.read() == b"rest"
@@ -0,0 +1,156 @@
+import json
+import struct
+import sys
+import tempfile
+
+from kkloader import EmocreMapData
+
+import pytest
+
+VECTOR = {"x": 0.5, "y": 0.0, "z": -1.5}
+COLOR = {"r": 1.0, "g": 0.5, "b": 0.0, "a": 1.0}
+UV = {"x": 0.0, "y": 0.0, "z": 1.0, "w": 1.0}
+
+
+# The map files are built byte by byte here instead of with kkloader,
+# so that the round trip is checked against the file format itself.
+def pack_string(value):
+    length = b""
+    n = len(value)
+    while n >= 0b10000000:
+        length += bytes([0b10000000 | n & 0b1111111])
+        n >>= 7
+    return length + bytes([n]) + value
+
+
+def pack_json(value):
+    return pack_string(json.dumps(value, separators=(",", ":")).encode())
+
+
+def pack_header(dickey, skip=False):
+    data = struct.pack("<i", dickey) + pack_json(VECTOR) + pack_json(VECTOR) + pack_json(VECTOR)
+    if not skip:
+        data += struct.pack("<ib", 0, 1)
+    return data
+
+
+def pack_children(children):
+    data = struct.pack("<i", len(children))
+    for nodetype, body in children:
+        data += struct.pack("<i", nodetype) + body
+    return data
+
+
+def item(version, *children):
+    data = pack_header(1) + struct.pack("<2if", 3, 42, 1.0)
+    for i in range(8):
+        data += pack_json(COLOR)
+    for key in range(3):
+        data += struct.pack("<ib", key, key % 2) + pack_json(UV) + struct.pack("<f", 0.5)
+    data += struct.pack("<f", 1.0) + pack_json(COLOR) + struct.pack("<f", 0.25) + pack_json(COLOR)
+    data += struct.pack("<2f", 0.0, 0.0)
+    if version > (0, 0, 3):
+        data += pack_header(7, skip=True)
+    if version > (0, 0, 5, 3):
+        data += struct.pack("<b", 1)
+    return 1, data + pack_children(children)
+
+
+def folder(name, *children):
+    return 3, pack_header(2) + pack_string(name) + pack_children(children)
+
+
+def area(*children):
+    return 4, pack_header(3) + pack_string(b"area") + pack_json(VECTOR) + pack_json(VECTOR) + pack_children(children)
+
+
+def pack_map(version, nodes):
+    parsed = tuple(int(x) for x in version.split("."))
+    data = struct.pack("<i", 200)
+    for value in ["【EroMakeMap】".encode(), version.encode(), b"u" * 20, b"d" * 20]:
+        data += pack_string(value)
+    data += struct.pack("<4i", 3, 0, 1, 3)
+    data += pack_string("テスト".encode()) + struct.pack("<i", 0)
+    if parsed > (0, 0, 5, 2):
+        data += struct.pack("<ib", len(nodes), 0)
+    data += struct.pack("<i", len(nodes))
+    for nodetype, body in nodes:
+        if parsed < (0, 0, 5, 2):
+            data += struct.pack("<i", -1)
+        data += struct.pack("<i", nodetype) + body
+    data += pack_string(b"0.0.0") + pack_json(VECTOR) + pack_json(VECTOR) + struct.pack("<3f", 10.0, 23.0, 1.0)
+    data += pack_json(COLOR) + struct.pack("<3fb2i", 1.0, 0.5, 0.25, 1, 1, 0)
+    return data
+
+
+def nested_folders(depth):
+    # children come last in a node, so a chain of folders is each folder's
+    # fields followed by a child count of 1 and the type of the next folder
+    level = pack_header(2) + pack_string(b"f") + struct.pack("<2i", 1, 3)
+    return 3, level * depth + pack_header(2) + pack_string(b"f") + struct.pack("<i", 0)
+
+
+@pytest.mark.parametrize("version", ["0.0.3", "0.0.5.1", "0.0.5.2", "0.0.5.3", "0.0.5.4"])
+def test_mapdata_roundtrip(version):
+    parsed = tuple(int(x) for x in version.split("."))
+    nodes = [
+        item(parsed, area()),
+        folder("フォルダ".encode(), item(parsed), folder(b"empty"), area(item(parsed))),
+        area(),
+    ]
+    raw = pack_map(version, nodes)
+
+    tmpfile = tempfile.NamedTemporaryFile()
+    with open(tmpfile.name, "wb") as f:
+        f.write(raw)
+    em = EmocreMapData.load(tmpfile.name, contains_png=False)
+    assert [i.nodetype for i in em.nodes] == [1, 3, 4]
+    assert [i.nodetype for i in em.nodes[1].nodes] == [1, 3, 4]
+    assert em.nodes[1].name == "フォルダ".encode()
+    assert em.nodes[1].nodes[2].nodes[0].colors == [COLOR] * 8
+    assert hasattr(em.nodes[0], "piller") == (parsed > (0, 0, 3))
+    assert hasattr(em.nodes[0], "sielding") == (parsed > (0, 0, 5, 3))
+    assert hasattr(em, "objects_num") == (parsed > (0, 0, 5, 2))
+    assert vars(em.nodes[0])["package"] == 3
+    assert vars(em.nodes[0].quantity)["pos"] == VECTOR
+
+    em.save(tmpfile.name)
+    em2 = EmocreMapData.load(tmpfile.name, contains_png=False)
+    assert bytes(em) == bytes(em2) == raw
+
+
+def test_mapdata_deep_nesting():
+    depth = sys.getrecursionlimit() * 2
+    em = EmocreMapData.load(pack_map("0.0.5.4", [nested_folders(depth)]), contains_png=False)
+
+    node = em.nodes[0]
+    for i in range(depth):
+        assert len(node.nodes) == 1
+        node = node.nodes[0]
+    assert node.nodes == []
+
+
+def test_mapdata_deep_nesting_save():
+    depth = sys.getrecursionlimit() * 2
+    raw = pack_map("0.0.5.4", [folder(b"top", item((0, 0, 5, 4)), nested_folders(depth), area())])
+    em = EmocreMapData.load(raw, contains_png=False)
+    assert bytes(em) == raw
+
+
+def test_mapdata_long_strings():
+    name = "長い名前".encode() * 20
+    raw = pack_map("0.0.5.4", [folder(name, folder(b"x" * 300)), item((0, 0, 5, 4))])
+    em = EmocreMapData.load(raw, contains_png=False)
+    assert em.nodes[0].name == name
+    assert em.nodes[0].nodes[0].name == b"x" * 300
+    assert bytes(em) == raw
+
+
+def test_mapdata_negative_child_count():
+    # a negative child count means no children, as with range()
+    folder_without_children = 3, pack_header(2) + pack_string(b"f") + struct.pack("<i", -1)
+    raw = pack_map("0.0.5.4", [folder_without_children, area()])
+    em = EmocreMapData.load(raw, contains_png=False)
+    assert [i.nodetype for i in em.nodes] == [3, 4]
+    assert em.nodes[0].nodes == []
+    assert em.camera_version == b"0.0.0"
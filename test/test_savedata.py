@@ -1,3 +1,5 @@
+import io
+import struct
 import tempfile
 
 from kkloader import KoikatuSaveData, SummerVacationSaveData
@@ -19,3 +21,11 @@ def test_summervacation_savedata():
     assert svsd.meta["WorldName"] == svsd2.meta["WorldName"]
     assert len(svsd.charas) == len(svsd.chara_details) == len(svsd2.charas) == len(svsd2.chara_details)
     assert bytes(svsd) == bytes(svsd2)
+
+
+def test_action_controls_negative_length():
+    data_stream = io.BytesIO(struct.pack("4i", 1, 1, 2, -1) + b"TRAILING")
+    ks = KoikatuSaveData()
+    ks._load_action_controls(data_stream)
+    assert ks.action_controls == [[1, 2, []]]
+    assert data_stream.read() == b"TRAILING"